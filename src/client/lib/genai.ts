@@ -0,0 +1,18 @@
+/**
+ * Shared GoogleGenAI clients, one per API key.
+ * Live sessions, TTS and LLM calls all reuse the same instance instead of
+ * constructing a fresh client per session or call.
+ */
+
+import { GoogleGenAI } from '@google/genai';
+
+const clients = new Map<string, GoogleGenAI>();
+
+export function getClient(apiKey: string): GoogleGenAI {
+  let client = clients.get(apiKey);
+  if (!client) {
+    client = new GoogleGenAI({ apiKey });
+    clients.set(apiKey, client);
+  }
+  return client;
+}
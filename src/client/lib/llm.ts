@@ -9,7 +9,7 @@
  *   for await (const chunk of llm.stream("Write a story")) { ... }
  */
 
-import { GoogleGenAI } from '@google/genai';
+import { getClient } from './genai';
 
 // --- Types ---
 
@@ -45,19 +45,6 @@ export interface LLM {
   json<T>(input: Input, schema: object, options?: CallOptions): Promise<T>;
 }
 
-// --- Client cache ---
-
-const clients = new Map<string, GoogleGenAI>();
-
-function getClient(apiKey: string): GoogleGenAI {
-  let client = clients.get(apiKey);
-  if (!client) {
-    client = new GoogleGenAI({ apiKey });
-    clients.set(apiKey, client);
-  }
-  return client;
-}
-
 // --- Internals ---
 
 function toContents(input: Input) {
@@ -13,7 +13,7 @@
  *   window.__recorder.download(0)
  */
 
-import { chunksToWav } from './stt';
+import { chunksToWav, uint8ToBase64 } from './stt';
 import { saveRecording } from './recording-db';
 
 interface Chunk {
@@ -71,10 +71,7 @@ export function setup(): RecorderHandle {
     const node = new AudioWorkletNode(ctx, 'recorder-proc');
     src.connect(node);
     node.port.onmessage = (e: MessageEvent<ArrayBuffer>) => {
-      const bytes = new Uint8Array(e.data);
-      let bin = '';
-      for (let i = 0; i < bytes.length; i++) bin += String.fromCharCode(bytes[i]);
-      buffer.push({ ts: Date.now() - t0, data: btoa(bin) });
+      buffer.push({ ts: Date.now() - t0, data: uint8ToBase64(new Uint8Array(e.data)) });
     };
     t0 = Date.now();
     console.log('[recorder] tapped mic stream');
@@ -6,7 +6,7 @@
  *   const { speak } = await import('/src/lib/tts.ts');
  */
 
-import { GoogleGenAI } from '@google/genai';
+import { getClient } from './genai';
 
 export interface TTSOptions {
   voice?: string;   // default: 'Kore'
@@ -18,7 +18,7 @@ export async function speak(
   text: string,
   options?: TTSOptions,
 ): Promise<{ data: string; sampleRate: number }> {
-  const client = new GoogleGenAI({ apiKey });
+  const client = getClient(apiKey);
   const response = await client.models.generateContent({
     model: options?.model ?? 'gemini-2.5-flash-preview-tts',
     contents: [{ parts: [{ text }] }],
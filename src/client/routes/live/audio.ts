@@ -4,18 +4,35 @@
  * Player: base64 PCM chunks at 24kHz → speakers (gapless scheduling).
  */
 
+import { uint8ToBase64 } from '../../lib/stt';
+
 // --- Mic Capture ---
 
+// Samples per posted chunk. The worklet runs every 128-frame render quantum
+// (8ms @ 16kHz); posting each one means ~125 base64 encodes + WebSocket sends
+// per second. 1024 frames = 64ms per chunk (~16/s) — at most 64ms of added
+// capture latency in exchange for 8x fewer sends. Lower it for snappier VAD.
+const MIC_CHUNK_FRAMES = 1024;
+
 const WORKLET_CODE = `
+const FRAMES = ${MIC_CHUNK_FRAMES};
 class PCMProcessor extends AudioWorkletProcessor {
+  constructor() {
+    super();
+    this.pcm = new Int16Array(FRAMES);
+    this.len = 0;
+  }
   process(inputs) {
     const ch = inputs[0]?.[0];
     if (ch) {
-      const pcm = new Int16Array(ch.length);
       for (let i = 0; i < ch.length; i++) {
-        pcm[i] = Math.max(-32768, Math.min(32767, ch[i] * 32767));
+        this.pcm[this.len++] = Math.max(-32768, Math.min(32767, ch[i] * 32767));
+        if (this.len === FRAMES) {
+          this.port.postMessage(this.pcm.buffer, [this.pcm.buffer]);
+          this.pcm = new Int16Array(FRAMES);
+          this.len = 0;
+        }
       }
-      this.port.postMessage(pcm.buffer, [pcm.buffer]);
     }
     return true;
   }
@@ -65,7 +82,8 @@ export interface PlayerHandle {
 export function createPlayer(): PlayerHandle {
   const ctx = new AudioContext({ sampleRate: 24000 });
   let nextTime = 0;
-  let sources: AudioBufferSourceNode[] = [];
+  // Set, not array — each onended is an O(1) delete instead of a filter pass
+  const sources = new Set<AudioBufferSourceNode>();
 
   return {
     play(base64: string) {
@@ -75,14 +93,14 @@ export function createPlayer(): PlayerHandle {
         bytes.byteOffset,
         bytes.byteLength / 2,
       );
-      const float32 = new Float32Array(int16.length);
+
+      // Convert straight into the AudioBuffer — no intermediate Float32Array
+      const buffer = ctx.createBuffer(1, int16.length, 24000);
+      const out = buffer.getChannelData(0);
       for (let i = 0; i < int16.length; i++) {
-        float32[i] = int16[i] / 32768;
+        out[i] = int16[i] / 32768;
       }
 
-      const buffer = ctx.createBuffer(1, float32.length, 24000);
-      buffer.getChannelData(0).set(float32);
-
       const src = ctx.createBufferSource();
       src.buffer = buffer;
       src.connect(ctx.destination);
@@ -91,9 +109,9 @@ export function createPlayer(): PlayerHandle {
       src.start(start);
       nextTime = start + buffer.duration;
 
-      sources.push(src);
+      sources.add(src);
       src.onended = () => {
-        sources = sources.filter((s) => s !== src);
+        sources.delete(src);
       };
     },
 
@@ -105,7 +123,7 @@ export function createPlayer(): PlayerHandle {
           /* already stopped */
         }
       }
-      sources = [];
+      sources.clear();
       nextTime = 0;
     },
 
@@ -123,24 +141,24 @@ export function playPcmChunks(
   sampleRate: number,
   onEnded?: () => void,
 ): { stop: () => void } {
-  const allBytes = chunks.map(base64ToUint8);
-  const totalLength = allBytes.reduce((sum, b) => sum + b.length, 0);
+  // Decode every chunk straight into one buffer — no per-chunk Uint8Array
+  // followed by a second copy into the combined one
+  const bins = chunks.map((c) => atob(c));
+  const totalLength = bins.reduce((sum, b) => sum + b.length, 0);
   const combined = new Uint8Array(totalLength);
   let offset = 0;
-  for (const b of allBytes) {
-    combined.set(b, offset);
-    offset += b.length;
+  for (const bin of bins) {
+    for (let i = 0; i < bin.length; i++) combined[offset++] = bin.charCodeAt(i);
   }
 
   const int16 = new Int16Array(combined.buffer, combined.byteOffset, combined.byteLength / 2);
-  const float32 = new Float32Array(int16.length);
-  for (let i = 0; i < int16.length; i++) {
-    float32[i] = int16[i] / 32768;
-  }
 
   const ctx = new AudioContext({ sampleRate });
-  const buffer = ctx.createBuffer(1, float32.length, sampleRate);
-  buffer.getChannelData(0).set(float32);
+  const buffer = ctx.createBuffer(1, int16.length, sampleRate);
+  const out = buffer.getChannelData(0);
+  for (let i = 0; i < int16.length; i++) {
+    out[i] = int16[i] / 32768;
+  }
 
   const src = ctx.createBufferSource();
   src.buffer = buffer;
@@ -162,14 +180,6 @@ export function playPcmChunks(
 
 // --- Base64 helpers ---
 
-function uint8ToBase64(bytes: Uint8Array): string {
-  let bin = '';
-  for (let i = 0; i < bytes.length; i++) {
-    bin += String.fromCharCode(bytes[i]);
-  }
-  return btoa(bin);
-}
-
 function base64ToUint8(b64: string): Uint8Array {
   const bin = atob(b64);
   const bytes = new Uint8Array(bin.length);
@@ -15,35 +15,59 @@ const MIN_CHARS = 40;
 /** Fallback flush timeout (ms) when no sentence boundary is found */
 const MAX_WAIT_MS = 1000;
 
+const DOT = 46, BANG = 33, QMARK = 63, SPACE = 32, NEWLINE = 10;
+
+function isTerminator(c: number): boolean {
+  return c === DOT || c === BANG || c === QMARK;
+}
+
 export function createSentenceBuffer(
   onFlush: (text: string) => void,
   { minChars = MIN_CHARS, maxWaitMs = MAX_WAIT_MS } = {},
 ): SentenceBuffer {
   let buf = '';
+  // Incremental scan state: boundaries before `scanPos` are already known
+  // (followed by whitespace, so they stay valid as text is appended).
+  let scanPos = 0;
+  let confirmed = -1;
   let timer: ReturnType<typeof setTimeout> | undefined;
 
+  function reset() {
+    buf = '';
+    scanPos = 0;
+    confirmed = -1;
+  }
+
   function resetTimer() {
     if (timer) { clearTimeout(timer); timer = undefined; }
     if (buf) {
       timer = setTimeout(() => {
         timer = undefined;
-        if (buf) { onFlush(buf.trim()); buf = ''; }
+        if (buf) { onFlush(buf.trim()); reset(); }
       }, maxWaitMs);
     }
   }
 
   function push(text: string) {
     buf += text;
-    // Find last sentence boundary after minChars
-    let lastBoundary = -1;
-    for (let i = 0; i < buf.length; i++) {
-      if ('.!?'.includes(buf[i]) && (i === buf.length - 1 || buf[i + 1] === ' ' || buf[i + 1] === '\n')) {
-        lastBoundary = i;
+    // Scan only the newly appended text (plus the previous last char,
+    // whose follower just arrived) — O(delta) per push, not O(buffer).
+    const last = buf.length - 1;
+    for (let i = scanPos; i < last; i++) {
+      if (isTerminator(buf.charCodeAt(i))) {
+        const next = buf.charCodeAt(i + 1);
+        if (next === SPACE || next === NEWLINE) confirmed = i;
       }
     }
+    scanPos = Math.max(scanPos, last);
+    // A terminator at the very end counts, but may be invalidated by the next push
+    const lastBoundary = last >= 0 && isTerminator(buf.charCodeAt(last)) ? last : confirmed;
     if (lastBoundary >= 0 && lastBoundary + 1 >= minChars) {
       const chunk = buf.slice(0, lastBoundary + 1).trim();
-      buf = buf.slice(lastBoundary + 1).trimStart();
+      const rest = buf.slice(lastBoundary + 1).trimStart();
+      scanPos = Math.max(0, scanPos - (buf.length - rest.length));
+      confirmed = -1;
+      buf = rest;
       if (timer) { clearTimeout(timer); timer = undefined; }
       onFlush(chunk);
     }
@@ -52,12 +76,12 @@ export function createSentenceBuffer(
 
   function flush() {
     if (timer) { clearTimeout(timer); timer = undefined; }
-    if (buf.trim()) { onFlush(buf.trim()); buf = ''; }
+    if (buf.trim()) { onFlush(buf.trim()); reset(); }
   }
 
   function clear() {
     if (timer) { clearTimeout(timer); timer = undefined; }
-    buf = '';
+    reset();
   }
 
   return { push, flush, clear };
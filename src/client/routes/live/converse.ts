@@ -71,7 +71,6 @@ export function createConverseApi(
         const decoder = new TextDecoder();
         let buf = '';
         let nChunks = 0;
-        let fullText = '';
         let ttft = 0;
 
         for (;;) {
@@ -88,12 +87,11 @@ export function createConverseApi(
             const data = JSON.parse(line.slice(6));
             if (data.text) {
               nChunks++;
-              fullText += data.text;
               if (nChunks === 1) {
                 ttft = Math.round(performance.now() - callT0);
                 console.log(`%c CLAUDE %c ${ts()} TTFT: ${ttft}ms`, ORANGE_BADGE, DIM);
               }
-              console.log(`%c${data.text}`, ORANGE_TEXT);
+              console.debug(`%c${data.text}`, ORANGE_TEXT);
               onChunk(data.text);
             }
             if (data.block) {
@@ -21,12 +21,12 @@
  */
 
 import {
-  GoogleGenAI,
   Modality,
   type LiveSendToolResponseParameters,
   type Session,
   type LiveServerMessage,
 } from '@google/genai';
+import { getClient } from '../../lib/genai';
 import { TOOLS, handleToolCall } from './tools';
 import { openTTSSession } from './tts-session';
 import { STOP_WORDS, startKeywordListener, startVoiceApproval } from './voice-approval';
@@ -67,7 +67,7 @@ interface ConnectDeps {
 export async function connectGemini(deps: ConnectDeps): Promise<LiveBackend | null> {
   const { data, converseApi, apiKey } = deps;
 
-  const ai = new GoogleGenAI({ apiKey });
+  const ai = getClient(apiKey);
   data.setStatus('connecting');
 
   // Mutable ref — handleMessage closes over this, assigned after connect().
@@ -10,10 +10,10 @@
  */
 
 import {
-  GoogleGenAI,
   Modality,
   type Session,
 } from '@google/genai';
+import { getClient } from '../../lib/genai';
 import { createSentenceBuffer } from './buffer';
 import { createPlayer } from './audio';
 import type { StreamingTTS } from './types';
@@ -53,7 +53,7 @@ export function openTTSSession(apiKey: string, isOutputMuted: () => boolean, onF
   const sentenceBuf = createSentenceBuffer((text) => { sendText(text); onFlush?.(text); });
 
   // Connect async — buffer text until ready
-  const ai = new GoogleGenAI({ apiKey });
+  const ai = getClient(apiKey);
   ai.live.connect({
     model: TTS_MODEL,
     config: {
@@ -66,21 +66,25 @@ export function openTTSSession(apiKey: string, isOutputMuted: () => boolean, onF
         console.log(`%c TTS %c connected`, GREEN_BADGE, DIM);
       },
       onmessage: (msg) => {
-        if (msg.serverContent?.modelTurn?.parts) {
-          for (const p of msg.serverContent.modelTurn.parts) {
-            if (p.inlineData?.data && !closed && !muted && !isOutputMuted()) {
-              if (!ttftLogged && firstSendT0) {
-                ttftLogged = true;
-                console.log(`%c TTS %c TTFT: ${Math.round(performance.now() - firstSendT0)}ms`, GREEN_BADGE, DIM);
-              }
-              player.play(p.inlineData.data);
+        const sc = msg.serverContent;
+        if (!sc) return;
+        // Playback gates can't change mid-message — check them once, not per part
+        const parts = sc.modelTurn?.parts;
+        if (parts && !closed && !muted && !isOutputMuted()) {
+          for (const p of parts) {
+            const data = p.inlineData?.data;
+            if (!data) continue;
+            if (!ttftLogged && firstSendT0) {
+              ttftLogged = true;
+              console.log(`%c TTS %c TTFT: ${Math.round(performance.now() - firstSendT0)}ms`, GREEN_BADGE, DIM);
             }
+            player.play(data);
           }
         }
-        if (msg.serverContent?.outputTranscription?.text) {
-          console.log(`%c TTS %c → ${msg.serverContent.outputTranscription.text}`, GREEN_BADGE, DIM);
+        if (sc.outputTranscription?.text) {
+          console.log(`%c TTS %c → ${sc.outputTranscription.text}`, GREEN_BADGE, DIM);
         }
-        if (msg.serverContent?.turnComplete) {
+        if (sc.turnComplete) {
           pendingSends = Math.max(0, pendingSends - 1);
           console.log(`%c TTS %c turnComplete (pending: ${pendingSends})`, GREEN_BADGE, DIM);
           if (finishing && pendingSends === 0) {
@@ -70,10 +70,24 @@ export type Chunk = TextDelta | ContentBlockChunk | Result;
 // --- Client ---
 
 export class Claude {
-  private readonly config: ClaudeConfig;
+  private readonly baseOptions: Options;
 
   constructor(config: ClaudeConfig) {
-    this.config = config;
+    // Everything that doesn't vary per turn is built once, including the
+    // process.env snapshot — copying it per request is pure overhead
+    this.baseOptions = {
+      includePartialMessages: true,
+      allowedTools: ['Read', 'WebSearch'],
+      disallowedTools: ['AskUserQuestion', 'Skill'],
+      env: subprocessEnv(config),
+      stderr: (line: string) => console.debug('sdk:', line.trimEnd()),
+    };
+    if (config.cliPath) {
+      this.baseOptions.pathToClaudeCodeExecutable = config.cliPath.replace(
+        /^~/,
+        process.env['HOME'] || '',
+      );
+    }
   }
 
   async *converse(
@@ -85,27 +99,18 @@ export class Claude {
       sessionId?: string;
       permissionMode?: PermissionMode;
       fork?: boolean;
+      abortController?: AbortController;
     },
   ): AsyncGenerator<Chunk> {
     const options: Options = {
+      ...this.baseOptions,
       model: opts.model,
       cwd: opts.cwd,
       systemPrompt: opts.systemPrompt,
-      includePartialMessages: true,
       permissionMode: opts.permissionMode ?? 'plan',
-      allowedTools: ['Read', 'WebSearch'],
-      disallowedTools: ['AskUserQuestion', 'Skill'],
-      env: subprocessEnv(this.config),
-      stderr: (line: string) => console.debug('sdk:', line.trimEnd()),
+      abortController: opts.abortController,
     };
 
-    if (this.config.cliPath) {
-      options.pathToClaudeCodeExecutable = this.config.cliPath.replace(
-        /^~/,
-        process.env['HOME'] || '',
-      );
-    }
-
     if (opts.sessionId) {
       options.resume = opts.sessionId;
       options.forkSession = opts.fork ?? false;
@@ -116,77 +121,87 @@ export class Claude {
     const stream = query({ prompt: message, options });
 
     for await (const msg of stream as AsyncIterable<SDKMessage>) {
-      if (msg.type === 'stream_event') {
-        const partial = msg as SDKPartialAssistantMessage;
-        const event = partial.event as unknown as Record<string, unknown>;
-        const delta = event['delta'] as Record<string, unknown> | undefined;
-        if (delta) {
-          const text = delta['text'];
-          if (typeof text === 'string' && text) {
-            yield { kind: 'text', text };
+      // One discriminant dispatch per message; stream_event is the token-rate case
+      switch (msg.type) {
+        case 'stream_event': {
+          const partial = msg as SDKPartialAssistantMessage;
+          const event = partial.event as unknown as Record<string, unknown>;
+          const delta = event['delta'] as Record<string, unknown> | undefined;
+          if (delta) {
+            const text = delta['text'];
+            if (typeof text === 'string' && text) {
+              yield { kind: 'text', text };
+            }
           }
+          break;
         }
-      } else if (msg.type === 'assistant') {
-        const asst = msg as SDKAssistantMessage;
-        const content = asst.message?.content;
-        if (Array.isArray(content)) {
-          for (const block of content) {
-            const b = block as unknown as Record<string, unknown>;
-            if (b['type'] === 'tool_use') {
-              yield {
-                kind: 'block',
-                block: {
-                  type: 'tool_use',
-                  id: b['id'],
-                  name: b['name'],
-                  input: b['input'],
-                },
-              };
+        case 'assistant': {
+          const asst = msg as SDKAssistantMessage;
+          const content = asst.message?.content;
+          if (Array.isArray(content)) {
+            for (const block of content) {
+              const b = block as unknown as Record<string, unknown>;
+              if (b['type'] === 'tool_use') {
+                yield {
+                  kind: 'block',
+                  block: {
+                    type: 'tool_use',
+                    id: b['id'],
+                    name: b['name'],
+                    input: b['input'],
+                  },
+                };
+              }
             }
           }
+          break;
         }
-      } else if (msg.type === 'user') {
-        const user = msg as SDKUserMessage;
-        const content = user.message?.content;
-        if (Array.isArray(content)) {
-          for (const block of content) {
-            const b = block as unknown as Record<string, unknown>;
-            if (b['type'] === 'tool_result') {
-              const raw = b['content'];
-              yield {
-                kind: 'block',
-                block: {
-                  type: 'tool_result',
-                  tool_use_id: b['tool_use_id'],
-                  content: typeof raw === 'string' ? raw : raw ? String(raw) : '',
-                },
-              };
+        case 'user': {
+          const user = msg as SDKUserMessage;
+          const content = user.message?.content;
+          if (Array.isArray(content)) {
+            for (const block of content) {
+              const b = block as unknown as Record<string, unknown>;
+              if (b['type'] === 'tool_result') {
+                const raw = b['content'];
+                yield {
+                  kind: 'block',
+                  block: {
+                    type: 'tool_result',
+                    tool_use_id: b['tool_use_id'],
+                    content: typeof raw === 'string' ? raw : raw ? String(raw) : '',
+                  },
+                };
+              }
             }
           }
+          break;
         }
-      } else if (msg.type === 'result') {
-        const result = msg as SDKResultMessage;
-        // Error handling: success has `result`, error subtypes have `errors[]`
-        let error: string | null = null;
-        if (result.is_error) {
-          if ('errors' in result && Array.isArray(result.errors)) {
-            error = result.errors.join('; ');
-          } else if ('result' in result) {
-            error = String(result.result);
+        case 'result': {
+          const result = msg as SDKResultMessage;
+          // Error handling: success has `result`, error subtypes have `errors[]`
+          let error: string | null = null;
+          if (result.is_error) {
+            if ('errors' in result && Array.isArray(result.errors)) {
+              error = result.errors.join('; ');
+            } else if ('result' in result) {
+              error = String(result.result);
+            }
           }
+          console.info(
+            `result: session=${result.session_id}, cost=$${result.total_cost_usd}, ${result.duration_ms}ms, error=${error}`,
+          );
+          yield {
+            kind: 'result',
+            sessionId: result.session_id,
+            costUsd: result.total_cost_usd,
+            durationMs: result.duration_ms,
+            error,
+          };
+          break;
         }
-        console.info(
-          `result: session=${result.session_id}, cost=$${result.total_cost_usd}, ${result.duration_ms}ms, error=${error}`,
-        );
-        yield {
-          kind: 'result',
-          sessionId: result.session_id,
-          costUsd: result.total_cost_usd,
-          durationMs: result.duration_ms,
-          error,
-        };
+        // Ignore other message types (system init, tool_progress, etc.)
       }
-      // Ignore other message types (system init, tool_progress, etc.)
     }
   }
 }
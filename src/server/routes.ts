@@ -3,24 +3,35 @@
  * SSE streaming, session listing, tree navigation.
  */
 
-import { existsSync, readdirSync } from 'node:fs';
+import { existsSync, statSync } from 'node:fs';
+import { readdir, stat } from 'node:fs/promises';
 import { join, basename } from 'node:path';
 import express, { type Request, type Response } from 'express';
 import cors from 'cors';
 import {
   Conversation,
+  cachedPreview,
   forkSession,
-  pathToSlug,
   preview,
+  prunePreviewCache,
   sessionPreview,
 } from '../shared/models.js';
 import { isUserEntry, isAssistantEntry } from '../shared/types.js';
 import type { ContentBlock } from '../shared/types.js';
-import { Claude, type ClaudeConfig } from './claude-client.js';
+import { Claude, projectDir, type ClaudeConfig } from './claude-client.js';
 import type { PermissionMode } from '@anthropic-ai/claude-agent-sdk';
 
 // --- App factory ---
 
+const CONV_CACHE_MAX = 64;
+const SSE_PING_MS = 15000;
+const PREVIEW_CONCURRENCY = 32;
+// Most uncached sessions tail-read per listing (newest first). The rest are
+// listed as pending, with their file mtime, until a later listing reads them.
+const PREVIEW_MAX_SESSIONS = 200;
+const TEXT_COALESCE_MS = 8;
+const TEXT_COALESCE_MAX = 2048;
+
 export interface ServerConfig {
   claude: ClaudeConfig;
   cwd: string;
@@ -29,29 +40,46 @@ export interface ServerConfig {
 
 export function createApp(cfg: ServerConfig): express.Express {
   const app = express();
+  // res.json() would otherwise SHA-1 every body for a weak ETag; API payloads
+  // are regenerated per request anyway. express.static keeps its own ETags.
+  app.set('etag', false);
   app.use(cors());
-  app.use(express.json());
 
   const claude = new Claude(cfg.claude);
   const PROJECT_CWD = cfg.cwd;
-  const PROJECT_SLUG = pathToSlug(PROJECT_CWD);
-
-  function projectDirPath(): string {
-    const expanded = cfg.claude.configDir.replace(/^~/, process.env['HOME'] || '');
-    return join(expanded, 'projects', PROJECT_SLUG);
-  }
+  const PROJECT_DIR = projectDir(cfg.claude, PROJECT_CWD);
 
   function findSessionFile(sessionId: string): string | null {
-    const candidate = join(projectDirPath(), `${sessionId}.jsonl`);
+    const candidate = join(PROJECT_DIR, `${sessionId}.jsonl`);
     return existsSync(candidate) ? candidate : null;
   }
 
+  // Parsed conversations by path, refreshed on (mtime, size) change.
+  // Map insertion order doubles as LRU order.
+  const convCache = new Map<string, { mtimeMs: number; size: number; conv: Conversation }>();
+
   function loadConversation(sessionId: string): Conversation {
     const path = findSessionFile(sessionId);
     if (!path) {
       throw { status: 404, message: `Session not found: ${sessionId}` };
     }
-    return Conversation.fromJsonl(path);
+    const { mtimeMs, size } = statSync(path);
+    const hit = convCache.get(path);
+    convCache.delete(path);
+    if (hit && hit.mtimeMs === mtimeMs && hit.size === size) {
+      convCache.set(path, hit);
+      return hit.conv;
+    }
+    // Session files are append-only — when one grew, parse just the new bytes.
+    // Same size with a new mtime means it was rewritten: parse it all.
+    const conv = hit && size > hit.size
+      ? Conversation.extendJsonl(hit.conv, path)
+      : Conversation.fromJsonl(path);
+    convCache.set(path, { mtimeMs, size, conv });
+    if (convCache.size > CONV_CACHE_MAX) {
+      convCache.delete(convCache.keys().next().value as string);
+    }
+    return conv;
   }
 
   // --- GET /api/config ---
@@ -66,27 +94,58 @@ export function createApp(cfg: ServerConfig): express.Express {
 
   // --- GET /api/sessions ---
 
-  app.get('/api/sessions', (_req: Request, res: Response) => {
-    const pdir = projectDirPath();
-    if (!existsSync(pdir)) {
+  app.get('/api/sessions', async (_req: Request, res: Response) => {
+    if (!existsSync(PROJECT_DIR)) {
       res.json([]);
       return;
     }
 
-    const files = readdirSync(pdir)
-      .filter((f) => f.endsWith('.jsonl'))
-      .map((f) => join(pdir, f));
-
-    const previews: { file: string; name: string; summary: string; timestamp: string }[] = [];
-    const seen = new Set<string>();
-
-    for (const f of files) {
-      const sid = basename(f, '.jsonl');
-      if (seen.has(sid)) continue;
-      seen.add(sid);
-      const { name, summary, timestamp } = sessionPreview(f);
-      if (name) {
-        previews.push({ file: f, name, summary, timestamp });
+    // One directory pass; dirent types come back with the names (scandir).
+    // Symlinked session files are still listed, as readdirSync's names were.
+    // Entry names never repeat, so each file is already one distinct session.
+    const files = (await readdir(PROJECT_DIR, { withFileTypes: true }))
+      .filter((d) => (d.isFile() || d.isSymbolicLink()) && d.name.endsWith('.jsonl'))
+      .map((d) => join(PROJECT_DIR, d.name));
+
+    const previews: {
+      file: string;
+      name: string;
+      summary: string;
+      timestamp: string;
+      pending: boolean;
+    }[] = [];
+
+    // A stat is far cheaper than a tail read, and serves any preview still
+    // cached for the same (mtime, size). Only cold misses are read, newest
+    // first and capped, so stale sessions beyond the cutoff are never opened.
+    const stats = await mapLimit(files, PREVIEW_CONCURRENCY, (f) => stat(f));
+    const entries = files.map((file, i) => ({
+      file,
+      st: stats[i],
+      preview: cachedPreview(file, stats[i]),
+    }));
+    const cold = entries
+      .filter((e) => !e.preview)
+      .sort((a, b) => b.st.mtimeMs - a.st.mtimeMs)
+      .slice(0, PREVIEW_MAX_SESSIONS);
+
+    // Tail reads are I/O-bound — overlap them, bounded to avoid fd exhaustion
+    const results = await mapLimit(cold, PREVIEW_CONCURRENCY, ({ file, st }) =>
+      sessionPreview(file, st),
+    );
+    cold.forEach((e, i) => {
+      e.preview = results[i];
+    });
+    prunePreviewCache(files);
+
+    for (const { file, st, preview: p } of entries) {
+      if (!p) {
+        // Not read yet: listed so it stays reachable, but it may turn out to
+        // have no user text, so clients must not open it
+        const timestamp = st.mtime.toISOString();
+        previews.push({ file, name: '', summary: '', timestamp, pending: true });
+      } else if (p.name) {
+        previews.push({ file, ...p, pending: false });
       }
     }
 
@@ -98,6 +157,7 @@ export function createApp(cfg: ServerConfig): express.Express {
         name: p.name,
         summary: p.summary,
         updated_at: p.timestamp,
+        pending: p.pending,
       })),
     );
   });
@@ -113,7 +173,7 @@ export function createApp(cfg: ServerConfig): express.Express {
       const result = conv.leaves.map((leaf) => ({
         uuid: leaf.uuid,
         type: leaf.type,
-        depth: conv.walkPath(leaf.uuid).length,
+        depth: conv.depthOf(leaf.uuid),
         preview: preview(leaf),
         is_active: leaf.uuid === activeUuid,
       }));
@@ -192,20 +252,10 @@ export function createApp(cfg: ServerConfig): express.Express {
             content: entry.message.content,
           });
         } else if (isAssistantEntry(entry)) {
-          // model_dump(exclude_none=True) equivalent: spread and filter nulls
-          const blocks = entry.message.content.map((block: ContentBlock) => {
-            const obj: Record<string, unknown> = {};
-            for (const [k, v] of Object.entries(block)) {
-              if (v !== null && v !== undefined) {
-                obj[k] = v;
-              }
-            }
-            return obj;
-          });
           messages.push({
             uuid: entry.uuid,
             role: 'assistant',
-            content: blocks,
+            content: entry.message.content.map(dumpBlock),
           });
         }
       }
@@ -218,7 +268,8 @@ export function createApp(cfg: ServerConfig): express.Express {
 
   // --- POST /api/converse (SSE) ---
 
-  app.post('/api/converse', async (req: Request, res: Response) => {
+  // Only route with a body — parse JSON here rather than in front of every GET
+  app.post('/api/converse', express.json(), async (req: Request, res: Response) => {
     const body = req.body as {
       instruction: string;
       session_id?: string;
@@ -253,10 +304,62 @@ export function createApp(cfg: ServerConfig): express.Express {
     res.setHeader('X-Accel-Buffering', 'no');
     res.flushHeaders();
 
+    // Frames emitted in the same tick are coalesced into one socket write
+    function write(frame: string): void {
+      if (!res.writableCorked) {
+        res.cork();
+        process.nextTick(() => res.uncork());
+      }
+      res.write(frame);
+    }
+
     function sse(data: Record<string, unknown>): void {
-      res.write(`data: ${JSON.stringify(data)}\n\n`);
+      flushText(); // keep buffered text ahead of the frame that follows it
+      write(`data: ${JSON.stringify(data)}\n\n`);
     }
 
+    // Hot path: serialize the string only, no wrapper object
+    function sseText(text: string): void {
+      write(`data: {"text":${JSON.stringify(text)}}\n\n`);
+    }
+
+    // Token-rate deltas are merged for up to TEXT_COALESCE_MS (or
+    // TEXT_COALESCE_MAX chars) and sent as one frame.
+    let pendingText = '';
+    let textTimer: ReturnType<typeof setTimeout> | null = null;
+
+    function flushText(): void {
+      if (textTimer) {
+        clearTimeout(textTimer);
+        textTimer = null;
+      }
+      if (pendingText) {
+        sseText(pendingText);
+        pendingText = '';
+      }
+    }
+
+    function queueText(text: string): void {
+      pendingText += text;
+      if (pendingText.length >= TEXT_COALESCE_MAX) flushText();
+      else if (!textTimer) textTimer = setTimeout(flushText, TEXT_COALESCE_MS);
+    }
+
+    // SSE comment frames keep idle proxies from dropping the stream during
+    // long silent tool runs; the client ignores non-`data:` lines.
+    const ping = setInterval(() => write(': ping\n\n'), SSE_PING_MS);
+
+    // Client went away mid-stream — stop the upstream query instead of draining it
+    const abort = new AbortController();
+    res.on('close', () => {
+      clearInterval(ping);
+      if (textTimer) clearTimeout(textTimer);
+      if (!res.writableFinished) {
+        console.info('converse: client disconnected, aborting query');
+        abort.abort();
+      }
+    });
+
     try {
       let nChunks = 0;
       for await (const chunk of claude.converse(body.instruction, {
@@ -266,12 +369,14 @@ export function createApp(cfg: ServerConfig): express.Express {
         sessionId,
         permissionMode: (body.permission_mode ?? 'plan') as PermissionMode,
         fork: shouldFork,
+        abortController: abort,
       })) {
+        if (abort.signal.aborted) break;
         switch (chunk.kind) {
           case 'text':
             if (chunk.text) {
               nChunks++;
-              sse({ text: chunk.text });
+              queueText(chunk.text);
             }
             break;
           case 'block':
@@ -294,10 +399,14 @@ export function createApp(cfg: ServerConfig): express.Express {
         }
       }
     } catch (e) {
-      console.error('converse error:', e);
-      sse({ done: true, error: e instanceof Error ? e.message : String(e) });
+      if (!abort.signal.aborted) {
+        console.error('converse error:', e);
+        sse({ done: true, error: e instanceof Error ? e.message : String(e) });
+      }
     }
 
+    if (!abort.signal.aborted) flushText();
+    clearInterval(ping);
     res.end();
   });
 
@@ -310,6 +419,44 @@ export function createApp(cfg: ServerConfig): express.Express {
   return app;
 }
 
+// --- Concurrency helper ---
+
+/** Like Promise.all(items.map(fn)), with at most `limit` calls in flight. */
+async function mapLimit<T, R>(items: T[], limit: number, fn: (item: T) => Promise<R>): Promise<R[]> {
+  const results = new Array<R>(items.length);
+  let next = 0;
+  async function worker(): Promise<void> {
+    while (next < items.length) {
+      const i = next++;
+      results[i] = await fn(items[i]);
+    }
+  }
+  await Promise.all(Array.from({ length: Math.min(limit, items.length) }, worker));
+  return results;
+}
+
+// --- Block serialization ---
+
+// Blocks of a cached Conversation are never mutated, so their dumps are
+// memoized for as long as the block itself is alive.
+const dumpedBlocks = new WeakMap<ContentBlock, Record<string, unknown>>();
+
+/** model_dump(exclude_none=True) equivalent: copy own fields, drop nulls. */
+function dumpBlock(block: ContentBlock): Record<string, unknown> {
+  let obj = dumpedBlocks.get(block);
+  if (obj !== undefined) return obj;
+  const src = block as Record<string, unknown>;
+  obj = {};
+  for (const k in src) {
+    const v = src[k];
+    if (v !== null && v !== undefined) {
+      obj[k] = v;
+    }
+  }
+  dumpedBlocks.set(block, obj);
+  return obj;
+}
+
 // --- Error helper ---
 
 function handleError(res: Response, e: unknown): void {
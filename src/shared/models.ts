@@ -4,10 +4,10 @@
  * plus _read_tail / _session_preview from server.py.
  */
 
-import { readFileSync, writeFileSync, statSync } from 'node:fs';
+import { closeSync, fstatSync, openSync, readFileSync, readSync, writeFileSync } from 'node:fs';
+import { open, stat } from 'node:fs/promises';
 import { dirname, join } from 'node:path';
 import { randomUUID } from 'node:crypto';
-import { openSync, readSync, closeSync } from 'node:fs';
 import type {
   SessionEntry,
   TreeEntry,
@@ -39,22 +39,18 @@ export function slugToPath(slug: string): string {
 // --- Tree Index ---
 
 interface TreeIndex {
-  byUuid: Map<string, TreeEntry[]>;
+  byUuid: Map<string, TreeEntry>; // last occurrence wins
   parentRefs: Set<string>;
 }
 
 function buildTreeIndex(records: SessionEntry[]): TreeIndex {
-  const byUuid = new Map<string, TreeEntry[]>();
+  const byUuid = new Map<string, TreeEntry>();
   const parentRefs = new Set<string>();
 
   for (const r of records) {
     if (!isTreeEntry(r)) continue;
-    const list = byUuid.get(r.uuid);
-    if (list) {
-      list.push(r);
-    } else {
-      byUuid.set(r.uuid, [r]);
-    }
+    // Re-setting an existing key keeps its first-seen position in iteration order
+    byUuid.set(r.uuid, r);
     if (r.parentUuid) {
       parentRefs.add(r.parentUuid);
     }
@@ -65,7 +61,22 @@ function buildTreeIndex(records: SessionEntry[]): TreeIndex {
 
 // --- Preview ---
 
-export function preview(entry: TreeEntry, limit = 100): string {
+const PREVIEW_LIMIT = 100;
+
+// Entries are never mutated after load, so default-limit previews are memoized
+const entryPreviews = new WeakMap<TreeEntry, string>();
+
+export function preview(entry: TreeEntry, limit = PREVIEW_LIMIT): string {
+  if (limit !== PREVIEW_LIMIT) return renderPreview(entry, limit);
+  let text = entryPreviews.get(entry);
+  if (text === undefined) {
+    text = renderPreview(entry, limit);
+    entryPreviews.set(entry, text);
+  }
+  return text;
+}
+
+function renderPreview(entry: TreeEntry, limit: number): string {
   const uid = entry.uuid.slice(0, 8);
   const etype = entry.type;
 
@@ -123,27 +134,79 @@ export function preview(entry: TreeEntry, limit = 100): string {
 
 // --- Conversation ---
 
+// Bytes before a parsed prefix's end that extendJsonl compares on reload
+const VERIFY_BYTES = 256;
+
 export class Conversation {
   readonly records: SessionEntry[];
+  // Set by fromJsonl/extendJsonl: bytes of the source that end in a newline,
+  // how many records came from them (the rest is an unterminated last line),
+  // and the last bytes of that prefix, re-checked before extending
+  private _offset = 0;
+  private _settled = 0;
+  private _verify = Buffer.alloc(0);
   private _treeCache: TreeIndex | null = null;
+  private _depthCache = new Map<string, number>();
+  private _leavesCache: TreeEntry[] | null = null;
+  private _activeLeafCache: TreeEntry | null | undefined = undefined;
+  private _entriesCache: { users: UserEntry[]; assistants: AssistantEntry[] } | null = null;
 
   constructor(records: SessionEntry[]) {
     this.records = records;
   }
 
   static fromJsonl(path: string): Conversation {
-    const content = readFileSync(path, 'utf-8');
-    const records: SessionEntry[] = [];
-    for (const line of content.split('\n')) {
-      const trimmed = line.trim();
-      if (!trimmed) continue;
-      try {
-        records.push(JSON.parse(trimmed) as SessionEntry);
-      } catch {
-        // skip malformed lines
+    return Conversation.parse(readFileSync(path), 0, [], 0);
+  }
+
+  /**
+   * Reload an append-only session file, parsing only what was written after
+   * `prev` was read. Falls back to a full parse if the file shrank or the
+   * last bytes `prev` consumed (up to VERIFY_BYTES, the end of its last
+   * complete line) changed. Only that window is compared, not the whole
+   * prefix, so callers should use fromJsonl when a file may be rewritten.
+   */
+  static extendJsonl(prev: Conversation, path: string): Conversation {
+    const fd = openSync(path, 'r');
+    try {
+      const { size } = fstatSync(fd);
+      const keep = prev._verify;
+      if (size < prev._offset) return Conversation.fromJsonl(path);
+      // Re-read the verify window along with the new bytes — one read
+      const from = prev._offset - keep.length;
+      const buf = Buffer.alloc(size - from);
+      const n = readSync(fd, buf, 0, buf.length, from);
+      if (n < keep.length || !buf.subarray(0, keep.length).equals(keep)) {
+        return Conversation.fromJsonl(path);
       }
+      return Conversation.parse(
+        buf.subarray(0, n), keep.length, prev.records.slice(0, prev._settled), from,
+      );
+    } finally {
+      closeSync(fd);
     }
-    return new Conversation(records);
+  }
+
+  /**
+   * Append the JSONL records in `buf` (read from byte `base`) to `records`,
+   * starting at `skip` — bytes before it were parsed already.
+   */
+  private static parse(
+    buf: Buffer, skip: number, records: SessionEntry[], base: number,
+  ): Conversation {
+    // Split on the last newline in bytes — a line still being written may end
+    // mid-character, so offsets can't come from the decoded string. buf[skip-1]
+    // is always a newline (or skip is 0), so cut never falls before skip.
+    const cut = buf.lastIndexOf(0x0a) + 1;
+    parseLines(buf.toString('utf-8', skip, cut), records);
+    const settled = records.length;
+    if (cut < buf.length) parseLines(buf.toString('utf-8', cut), records);
+    const conv = new Conversation(records);
+    conv._offset = base + cut;
+    conv._settled = settled;
+    // Copy so the window doesn't pin the whole read buffer
+    conv._verify = Buffer.from(buf.subarray(Math.max(0, cut - VERIFY_BYTES), cut));
+    return conv;
   }
 
   private get tree(): TreeIndex {
@@ -153,12 +216,26 @@ export class Conversation {
     return this._treeCache;
   }
 
+  /** User and assistant entries, split out in one pass over the records. */
+  private get entries(): { users: UserEntry[]; assistants: AssistantEntry[] } {
+    if (!this._entriesCache) {
+      const users: UserEntry[] = [];
+      const assistants: AssistantEntry[] = [];
+      for (const r of this.records) {
+        if (isUserEntry(r)) users.push(r);
+        else if (isAssistantEntry(r)) assistants.push(r);
+      }
+      this._entriesCache = { users, assistants };
+    }
+    return this._entriesCache;
+  }
+
   get userEntries(): UserEntry[] {
-    return this.records.filter(isUserEntry);
+    return this.entries.users;
   }
 
   get assistantEntries(): AssistantEntry[] {
-    return this.records.filter(isAssistantEntry);
+    return this.entries.assistants;
   }
 
   get title(): string {
@@ -185,28 +262,30 @@ export class Conversation {
   }
 
   get leaves(): TreeEntry[] {
+    if (this._leavesCache) return this._leavesCache;
     const t = this.tree;
     const result: TreeEntry[] = [];
-    for (const [uid, elist] of t.byUuid) {
+    for (const [uid, entry] of t.byUuid) {
       if (!t.parentRefs.has(uid)) {
-        result.push(elist[elist.length - 1]);
+        result.push(entry);
       }
     }
+    this._leavesCache = result;
     return result;
   }
 
   get activeLeaf(): TreeEntry | null {
-    const allLeaves = this.leaves;
-    if (allLeaves.length === 0) return null;
+    if (this._activeLeafCache !== undefined) return this._activeLeafCache;
     let best: TreeEntry | null = null;
     let bestDepth = -1;
-    for (const leaf of allLeaves) {
-      const depth = this.walkPath(leaf.uuid).length;
+    for (const leaf of this.leaves) {
+      const depth = this.depthOf(leaf.uuid);
       if (depth > bestDepth) {
         bestDepth = depth;
         best = leaf;
       }
     }
+    this._activeLeafCache = best;
     return best;
   }
 
@@ -218,18 +297,63 @@ export class Conversation {
 
     while (uid && !seen.has(uid)) {
       seen.add(uid);
-      const elist = t.byUuid.get(uid);
-      if (!elist) break;
-      const entry = elist[elist.length - 1]; // last occurrence
+      const entry = t.byUuid.get(uid);
+      if (!entry) break;
       path.push(entry);
       uid = entry.parentUuid;
     }
     return path;
   }
+
+  /** `walkPath(uuid).length`, memoized — shared ancestors are walked once. */
+  depthOf(uuid: string): number {
+    const t = this.tree;
+    const chain: string[] = [];
+    const onChain = new Set<string>();
+    let base = 0;
+    let uid: string | null = uuid;
+
+    while (uid) {
+      const known = this._depthCache.get(uid);
+      if (known !== undefined) {
+        base = known;
+        break;
+      }
+      if (onChain.has(uid)) return this.walkPath(uuid).length; // cycle: don't memoize
+      const entry = t.byUuid.get(uid);
+      if (!entry) break;
+      chain.push(uid);
+      onChain.add(uid);
+      uid = entry.parentUuid;
+    }
+
+    for (let i = chain.length - 1; i >= 0; i--) {
+      this._depthCache.set(chain[i], ++base);
+    }
+    return this._depthCache.get(uuid) ?? 0;
+  }
 }
 
 // --- Helpers ---
 
+function parseLines(content: string, records: SessionEntry[]): void {
+  // Walk newline offsets instead of split() — no array of every line
+  let start = 0;
+  while (start < content.length) {
+    let end = content.indexOf('\n', start);
+    if (end === -1) end = content.length;
+    // JSON.parse already ignores surrounding whitespace (incl. \r) — no trim copy
+    const line = content.slice(start, end);
+    start = end + 1;
+    if (!line) continue;
+    try {
+      records.push(JSON.parse(line) as SessionEntry);
+    } catch {
+      // skip malformed lines
+    }
+  }
+}
+
 function firstUserText(entries: UserEntry[]): string {
   for (const entry of entries) {
     if (typeof entry.message.content === 'string') {
@@ -274,9 +398,9 @@ export function forkSession(originalPath: string, leafUuid: string): string {
 
   const lines: string[] = [JSON.stringify(qop)];
   for (const entry of pathEntries) {
-    const raw = JSON.parse(JSON.stringify(entry)) as Record<string, unknown>;
-    raw['sessionId'] = newSid;
-    lines.push(JSON.stringify(raw));
+    // Shallow spread, not a JSON deep clone: only sessionId changes, and the
+    // existing key keeps its position, so the line serializes identically
+    lines.push(JSON.stringify({ ...entry, sessionId: newSid }));
   }
 
   writeFileSync(newPath, lines.join('\n') + '\n');
@@ -285,39 +409,57 @@ export function forkSession(originalPath: string, leafUuid: string): string {
 
 // --- Tail read (fast preview without loading full JSONL) ---
 
-export function readTail(path: string, nbytes = 32768): JsonDict[] {
-  const fd = openSync(path, 'r');
+export async function readTail(path: string, nbytes = 32768): Promise<Iterable<Buffer>> {
+  const fh = await open(path, 'r');
   try {
-    const stat = statSync(path);
-    const size = stat.size;
+    const { size } = await fh.stat();
     const chunk = Math.min(nbytes, size);
     const buf = Buffer.alloc(chunk);
-    readSync(fd, buf, 0, chunk, size - chunk);
-    const tail = buf.toString('utf-8');
-
-    const result: JsonDict[] = [];
-    const lines = tail.trim().split('\n');
-    for (let i = lines.length - 1; i >= 0; i--) {
-      try {
-        result.push(JSON.parse(lines[i]) as JsonDict);
-      } catch {
-        // skip
-      }
-    }
-    return result;
+    await fh.read(buf, 0, chunk, size - chunk);
+    return tailLines(buf);
   } finally {
-    closeSync(fd);
+    await fh.close();
+  }
+}
+
+/**
+ * Raw JSONL lines newest-first, as views into `buf` — nothing is decoded
+ * until the consumer asks, and consumers that stop early never touch the rest.
+ */
+function* tailLines(buf: Buffer): Generator<Buffer> {
+  let end = buf.length;
+  while (end > 0) {
+    const nl = buf.lastIndexOf(0x0a, end - 1);
+    if (end > nl + 1) yield buf.subarray(nl + 1, end);
+    end = nl;
+  }
+}
+
+function parseLine(line: Buffer): JsonDict | null {
+  try {
+    return JSON.parse(line.toString('utf-8')) as JsonDict;
+  } catch {
+    return null; // malformed, or cut off by the window start
   }
 }
 
+const USER_MARK = Buffer.from('"user"');
+const ASSISTANT_MARK = Buffer.from('"assistant"');
+
 export function extractPreview(
-  entries: JsonDict[],
+  lines: Iterable<Buffer>,
 ): { name: string; summary: string; timestamp: string } {
   let timestamp = '';
   let name = '';
   let summary = '';
 
-  for (const entry of entries) {
+  for (const line of lines) {
+    // Past the newest timestamp only user/assistant entries matter. A line
+    // without either string can't be one, so skip it unparsed (progress,
+    // snapshots, queue ops...).
+    if (timestamp && line.indexOf(USER_MARK) < 0 && line.indexOf(ASSISTANT_MARK) < 0) continue;
+    const entry = parseLine(line);
+    if (!entry) continue;
     const entryType = entry['type'] as string | undefined;
 
     if (!timestamp) {
@@ -364,15 +506,60 @@ export function extractPreview(
 const TAIL_START = 32768;
 const TAIL_MAX = 262144;
 
-export function sessionPreview(path: string): { name: string; summary: string; timestamp: string } {
-  let nbytes = TAIL_START;
+type Preview = { name: string; summary: string; timestamp: string };
+
+// Session files are append-only, so (mtime, size) identifies their content.
+// `nbytes` is the window that last found the name; a re-scan starts there.
+const previewCache = new Map<
+  string,
+  { mtimeMs: number; size: number; nbytes: number; preview: Preview }
+>();
+
+/** Pass `st` when the caller already has the file's stat. */
+export async function sessionPreview(
+  path: string,
+  st?: { mtimeMs: number; size: number },
+): Promise<Preview> {
+  const { mtimeMs, size } = st ?? (await stat(path));
+  const cached = cachedPreview(path, { mtimeMs, size });
+  if (cached) return cached;
+  const hit = previewCache.get(path);
+  const { nbytes, preview } = await scanPreview(path, size, hit?.nbytes ?? TAIL_START);
+  previewCache.set(path, { mtimeMs, size, nbytes, preview });
+  return preview;
+}
+
+/** The cached preview for `path` if it is still current — no I/O. */
+export function cachedPreview(
+  path: string,
+  st: { mtimeMs: number; size: number },
+): Preview | undefined {
+  const hit = previewCache.get(path);
+  return hit && hit.mtimeMs === st.mtimeMs && hit.size === st.size ? hit.preview : undefined;
+}
+
+/** Drop cached previews for files not in `live` (e.g. deleted sessions). */
+export function prunePreviewCache(live: Iterable<string>): void {
+  const keep = new Set(live);
+  for (const path of previewCache.keys()) {
+    if (!keep.has(path)) previewCache.delete(path);
+  }
+}
+
+async function scanPreview(
+  path: string,
+  size: number,
+  start: number,
+): Promise<{ nbytes: number; preview: Preview }> {
+  let nbytes = start;
   let timestamp = '';
   while (nbytes <= TAIL_MAX) {
-    const entries = readTail(path, nbytes);
+    const entries = await readTail(path, nbytes);
     const result = extractPreview(entries);
     timestamp = result.timestamp || timestamp;
-    if (result.name) return result;
+    if (result.name) return { nbytes, preview: result };
+    if (nbytes >= size) break; // whole file already seen; a wider window adds nothing
     nbytes *= 2;
   }
-  return { name: '', summary: '', timestamp };
+  return { nbytes: start, preview: { name: '', summary: '', timestamp } };
 }